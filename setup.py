@@ -90,10 +90,8 @@ setup(
         'fasteners',
         'pyyaml',
         'pygments',
-        # for DAG, some version requires pydot, some requires pydotplus
+        # for DAG
         'networkx',
-        'pydot',
-        'pydotplus',
         'pexpect',
         # required by windows
         'ptyprocess',
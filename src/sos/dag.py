@@ -4,8 +4,11 @@
 # Distributed under the terms of the 3-clause BSD License.
 import copy
 import pickle
+import re
+import sys
 import time
-from collections import defaultdict
+from array import array
+from collections import defaultdict, deque
 
 import fasteners
 import networkx as nx
@@ -76,6 +79,31 @@ from typing import Union
 #
 
 
+def dot_id(name) -> str:
+    '''Return name as an ID in dot format, quoted unless it is a plain identifier'''
+    name = str(name)
+    if re.fullmatch(r'[a-zA-Z_][a-zA-Z0-9_]*', name) and name.lower() not in (
+            'node', 'edge', 'graph', 'digraph', 'subgraph', 'strict'):
+        return name
+    return '"' + name.replace('"', '\\"') + '"'
+
+
+def _kahn(offsets: array, targets: array, in_degree: array) -> list:
+    '''Kahn's algorithm on a graph with nodes numbered from 0, where the
+    successors of node i are targets[offsets[i]:offsets[i + 1]]. Nodes
+    without incoming edges are removed repeatedly and the nodes that cannot
+    be removed, which are on or downstream of a cycle, are returned.
+    in_degree is modified in place.'''
+    queue = deque(idx for idx, degree in enumerate(in_degree) if degree == 0)
+    while queue:
+        idx = queue.popleft()
+        for succ in targets[offsets[idx]:offsets[idx + 1]]:
+            in_degree[succ] -= 1
+            if in_degree[succ] == 0:
+                queue.append(succ)
+    return [idx for idx, degree in enumerate(in_degree) if degree > 0]
+
+
 class SoS_Node(object):
 
     def __init__(self, step_uuid: str, node_name: str,
@@ -83,7 +111,7 @@ class SoS_Node(object):
                  input_targets: sos_targets, depends_targets: sos_targets,
                  output_targets: sos_targets, context: dict) -> None:
         self._step_uuid = step_uuid
-        self._node_id = node_name
+        self._node_id = sys.intern(node_name)
         self._wf_index = wf_index
         self._node_index = node_index
         self._input_targets = input_targets
@@ -117,6 +145,8 @@ class SoS_DAG(nx.DiGraph):
         # all_input
         self._all_depends_files = defaultdict(list)
         self._all_output_files = defaultdict(list)
+        # nodes by their unique IDs
+        self._nodes_by_uuid = {}
         # index of mini
         self._forward_workflow_id = 0
         # if dag has been changed
@@ -156,7 +186,7 @@ class SoS_DAG(nx.DiGraph):
             step_uuid, node_name,
             None if node_index is None else self._forward_workflow_id,
             node_index, input_targets, depends_targets, output_targets, context)
-        if node._node_uuid in [x._node_uuid for x in self.nodes()]:
+        if node._node_uuid in self._nodes_by_uuid:
             return
         # adding a step would add a sos_step target to met the depends on sos_step
         # requirement of some steps.
@@ -175,6 +205,7 @@ class SoS_DAG(nx.DiGraph):
             for x in context['__changed_vars__']:
                 if node not in self._all_output_files[sos_variable(x)]:
                     self._all_output_files[sos_variable(x)].append(node)
+        self._nodes_by_uuid[node._node_uuid] = node
         self.add_node(node)
 
     def update_step(self, node, input_targets: sos_targets,
@@ -230,9 +261,8 @@ class SoS_DAG(nx.DiGraph):
         return None
 
     def node_by_id(self, node_uuid):
-        for node in self.nodes():
-            if node._node_uuid == node_uuid:
-                return node
+        if node_uuid in self._nodes_by_uuid:
+            return self._nodes_by_uuid[node_uuid]
         raise RuntimeError(f'Failed to locate node with UUID {node_uuid}')
 
     def show_nodes(self):
@@ -241,14 +271,57 @@ class SoS_DAG(nx.DiGraph):
         for edge in self.edges():
             print(edge)
 
+    def dot_lines(self):
+        '''Yield the DAG in dot format, one line at a time. Nodes are sorted
+        by id and edges by the ids of their ends so that the output is
+        deterministic.'''
+        yield f'strict digraph {dot_id(self.name)} {{'
+        # quote each node only once, not once for every edge it is part of
+        ids = {node: dot_id(node) for node in self.succ}
+        names = {node: str(node) for node in self.succ}
+        for node in sorted(self.succ, key=names.get):
+            attrs = self.nodes[node]
+            if attrs:
+                yield f'{ids[node]} [{", ".join(f"{k}={dot_id(v)}" for k, v in attrs.items())}];'
+            else:
+                yield f'{ids[node]};'
+        for u, v in sorted(((u, v)
+                            for u, successors in self.succ.items()
+                            for v in successors),
+                           key=lambda e: (names[e[0]], names[e[1]])):
+            yield f'{ids[u]} -> {ids[v]};'
+        yield '}'
+
     def circular_dependencies(self):
         if 'DAG' in env.config['SOS_DEBUG'] or 'ALL' in env.config['SOS_DEBUG']:
             env.log_to_file('DAG', 'check circular')
-        try:
-            return nx.find_cycle(self)
-        except Exception:
-            # if there is no cycle, an exception is given
+        # number the nodes and pack the edges into integer arrays, so that
+        # successors of node i are targets[offsets[i]:offsets[i + 1]]
+        nodes = list(self.succ)
+        index = {node: idx for idx, node in enumerate(nodes)}
+        offsets = array('i', [0])
+        targets = array('i')
+        for node in nodes:
+            targets.extend(index[x] for x in self.succ[node])
+            offsets.append(len(targets))
+        in_degree = array('i', (len(self.pred[node]) for node in nodes))
+        remaining = {nodes[idx] for idx in _kahn(offsets, targets, in_degree)}
+        if not remaining:
             return []
+        # every remaining node has at least one remaining predecessor so
+        # walking up the predecessors will eventually revisit a node
+        node = next(iter(remaining))
+        path = [node]
+        visited = {node: 0}
+        while True:
+            node = next(x for x in self.pred[node] if x in remaining)
+            if node in visited:
+                break
+            visited[node] = len(path)
+            path.append(node)
+        # the path was collected against the direction of the edges
+        cycle = path[visited[node]:][::-1]
+        return list(zip(cycle, cycle[1:] + cycle[:1]))
 
     def steps_depending_on(self, target: BaseTarget, workflow):
         if target in self._all_depends_files and self._all_depends_files[target]:
@@ -339,8 +412,13 @@ class SoS_DAG(nx.DiGraph):
         # several cases triggers dependency.
         if 'DAG' in env.config['SOS_DEBUG'] or 'ALL' in env.config['SOS_DEBUG']:
             env.log_to_file('DAG', 'build DAG')
-        for wf in range(self._forward_workflow_id + 1):
-            indexed = [x for x in self.nodes() if x._wf_index == wf]
+        # group indexed nodes by forward workflow in a single pass
+        workflows = defaultdict(list)
+        for node in self.nodes():
+            if node._wf_index is not None:
+                workflows[node._wf_index].append(node)
+        for wf in sorted(workflows):
+            indexed = workflows[wf]
             indexed.sort(key=lambda x: x._node_index)
 
             for idx, node in enumerate(indexed):
@@ -407,10 +485,7 @@ class SoS_DAG(nx.DiGraph):
             elif x._status is not None:
                 env.logger.warning(f'Unmarked step status {x._status}')
 
-        try:
-            out = nx.drawing.nx_pydot.to_pydot(self).to_string()
-        except Exception as e:
-            env.logger.warning(f'Failed to call to_pydot: {e}')
+        out = list(self.dot_lines())
 
         if self.last_dag == out:
             return
@@ -418,7 +493,7 @@ class SoS_DAG(nx.DiGraph):
             self.last_dag = out
         # output file name
         if hasattr(dest, 'write'):
-            dest.write(out)
+            dest.writelines(x + '\n' for x in out)
         else:
             with open(dest, 'a' if self.last_dag else 'w') as dfile:
-                dfile.write(out)
+                dfile.writelines(x + '\n' for x in out)
@@ -1231,7 +1231,9 @@ class SoS_Script:
                                     line,
                                     "Unindexed section name cannot contain wildcard character (*).",
                                 )
-                            step_names.append([n, int(i) if i else i, al])
+                            # step names are compared repeatedly when workflows
+                            # and the DAG are assembled
+                            step_names.append([sys.intern(n), int(i) if i else i, al])
                         if di:
                             step_names.append(["", int(di), al])
                     else:
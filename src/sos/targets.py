@@ -9,6 +9,7 @@ import os
 import re
 import shlex
 import shutil
+import stat
 import subprocess
 import sys
 from collections.abc import Iterable, Sequence
@@ -746,13 +747,18 @@ class path(type(Path())):
 
     def zap(self):
         zap_file = self + ".zapped"
-        if not self.exists() and zap_file.is_file():
-            return
-        if not self.exists() or not self.is_file():
+        # a single stat for the common case of an existing regular file
+        try:
+            st = os.stat(self)
+        except (FileNotFoundError, NotADirectoryError):
+            if zap_file.is_file():
+                return
+            raise FileNotFoundError(str(self)) from None
+        if not stat.S_ISREG(st.st_mode):
             raise FileNotFoundError(str(self))
         with open(zap_file, "w") as md5:
             md5.write(
-                f"{self.resolve()}\t{os.path.getmtime(self)}\t{os.path.getsize(self)}\t{fileMD5(self)}\n"
+                f"{self.resolve()}\t{st.st_mtime}\t{st.st_size}\t{fileMD5(self)}\n"
             )
         self.unlink()
 
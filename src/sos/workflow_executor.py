@@ -14,7 +14,6 @@ import zmq
 
 from collections import defaultdict
 from collections.abc import Sequence
-from io import StringIO
 from typing import Any, Dict, List, Optional, Union
 from threading import Event
 
@@ -53,7 +52,6 @@ from .utils import (
     pickleable,
     short_repr,
     get_localhost_ip,
-    textMD5,
 )
 from .executor_utils import prepare_env, ExecuteError
 from .messages import encode_msg, decode_msg
@@ -264,7 +262,7 @@ class Base_Executor:
         config: Optional[Dict[str, Any]] = {},
     ) -> None:
         self.workflow = workflow
-        self.local_ip = get_localhost_ip()
+        self._local_ip = None
 
         # args serves as two purposes
         # in the master workflow, args is the command line argument and there is no workflow variables
@@ -320,6 +318,14 @@ class Base_Executor:
             section.global_def = global_def
             section.global_vars = global_vars
 
+    @property
+    def local_ip(self):
+        # looked up on first use so that executors that only build the DAG
+        # do not have to open a socket
+        if self._local_ip is None:
+            self._local_ip = get_localhost_ip()
+        return self._local_ip
+
     def write_workflow_info(self):
         # if this is the outter most workflow, master)id should have =
         # not been set so we set it for all other workflows
@@ -850,8 +856,8 @@ class Base_Executor:
         context["__dynamic_input__"] = res["dynamic_input"]
 
         # NOTE: If a step is called multiple times with different targets, it is much better
-        # to use different names because pydotplus can be very slow in handling graphs with nodes
-        # with identical names.
+        # to use different names because nodes with identical names would be merged into one
+        # node in the DAG saved in dot format.
         node_name = section.step_name()
         if env.sos_dict["__default_output__"]:
             node_name += f' ({short_repr(env.sos_dict["__default_output__"])})'
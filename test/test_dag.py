@@ -3,12 +3,14 @@
 # Copyright (c) Bo Peng and the University of Texas MD Anderson Cancer Center
 # Distributed under the terms of the 3-clause BSD License.
 
+import functools
 import textwrap
 from io import StringIO
 
 import pytest
 
 from sos import execute_workflow
+from sos.dag import SoS_DAG, dot_id
 from sos.parser import SoS_Script
 from sos.targets import file_target
 from sos.utils import env
@@ -16,28 +18,35 @@ from sos.utils import env
 from sos.workflow_executor import Base_Executor
 
 
+@functools.lru_cache(maxsize=None)
+def lines_of_dot(dot):
+    '''Lines of a DAG in dot format, without the graph header. The result is
+    cached so that each expected DAG is only processed once.'''
+    return tuple(
+        x.strip() for x in dot.split('\n') if x.strip() and not 'digraph' in x)
+
+
 def assertDAG(dag, content):
-    '''Compare the content of dag in a file, to one of more DAG (strings).'''
+    '''Compare the content of dag in a file, to one of more DAG (strings).
+    Nodes of the expected DAGs should be sorted by id and edges by the ids
+    of their ends, which is how SoS_DAG.dot_lines() outputs them.'''
     if isinstance(dag, str):
         with open(dag) as d:
             # only get the first DAG
-            dot = 'strict' + d.read().split('strict')[1]
+            dot = lines_of_dot('strict' + d.read().split('strict')[1])
     else:
-        out = StringIO()
-        dag.save(out)
-        dot = out.getvalue()
-
-    def sorted_dot(dot):
-        return sorted([
-            x.strip()
-            for x in dot.split('\n')
-            if x.strip() and not 'digraph' in x
-        ])
+        dot = tuple(x for x in dag.dot_lines() if not 'digraph' in x)
 
     if isinstance(content, str):
-        assert sorted_dot(dot) == sorted_dot(content)
+        assert dot == lines_of_dot(content)
     else:
-        assert sorted_dot(dot) in [sorted_dot(x) for x in content]
+        assert dot in [lines_of_dot(x) for x in content]
+
+
+@pytest.fixture(autouse=True)
+def run_in_temp_dir(tmp_path, monkeypatch):
+    '''Run each test in its own directory so that tests do not share files'''
+    monkeypatch.chdir(tmp_path)
 
 
 def get_initial_dag(test):
@@ -64,12 +73,12 @@ def test_simple_dag(temp_factory):
 
             [A_4]''')
         , textwrap.dedent('''strict digraph "" {
-            A_2;
-            A_4;
             A_1;
+            A_2;
             A_3;
-            A_2 -> A_3;
+            A_4;
             A_1 -> A_2;
+            A_2 -> A_3;
             A_3 -> A_4;
             }
             '''))
@@ -86,10 +95,10 @@ def test_simple_dag(temp_factory):
 
             [A_4]''')
         , textwrap.dedent('''strict digraph "" {
-            A_2;
-            A_4;
             A_1;
+            A_2;
             A_3;
+            A_4;
             A_1 -> A_2;
             A_3 -> A_4;
             }
@@ -116,12 +125,12 @@ def test_simple_dag(temp_factory):
             output: 'e.txt'
             ''')
         , textwrap.dedent('''strict digraph "" {
-            A_2;
-            A_4;
             A_1;
+            A_2;
             A_3;
-            A_2 -> A_3;
+            A_4;
             A_1 -> A_2;
+            A_2 -> A_3;
             A_3 -> A_4;
             }
             '''))
@@ -148,10 +157,10 @@ def test_simple_dag(temp_factory):
             output: 'e.txt'
             ''')
         , textwrap.dedent('''strict digraph "" {
-            B_2;
-            B_4;
             B_1;
+            B_2;
             B_3;
+            B_4;
             B_1 -> B_2;
             B_3 -> B_4;
             }
@@ -180,9 +189,9 @@ def test_simple_dag(temp_factory):
             ''')
         , textwrap.dedent('''strict digraph "" {
             B_1;
-            B_4;
             B_2;
             B_3;
+            B_4;
             B_1 -> B_2;
             B_3 -> B_4;
             }
@@ -213,9 +222,9 @@ def test_simple_dag(temp_factory):
         , textwrap.dedent('''
             strict digraph "" {
             C_1;
-            C_4;
             C_2;
             C_3;
+            C_4;
             C_1 -> C_2;
             C_1 -> C_3;
             C_3 -> C_4;
@@ -246,14 +255,12 @@ def test_undetermined(temp_factory):
             depends: 'd.txt'
             output: 'e.txt'
             ''')
-                # dag.show_nodes()
-                # dag.save('a.dot')
         , textwrap.dedent('''
             strict digraph "" {
             C_1;
-            C_4;
             C_2;
             C_3;
+            C_4;
             C_1 -> C_2;
             C_2 -> C_3;
             C_3 -> C_4;
@@ -282,16 +289,16 @@ def test_undetermined(temp_factory):
         , textwrap.dedent('''
             strict digraph "" {
             C_1;
-            C_4;
             C_2;
             C_3;
+            C_4;
             C_1 -> C_2;
             C_2 -> C_3;
             C_3 -> C_4;
             }
             '''))
 
-def test_auxiliary_steps(temp_factory,clear_now_and_after):
+def test_auxiliary_steps(temp_factory):
     graph = textwrap.dedent(('''
         [K: provides='{name}.txt']
         output: f"{name}.txt"
@@ -312,7 +319,6 @@ def test_auxiliary_steps(temp_factory,clear_now_and_after):
         '''))
     # a.txt exists and b.txt does not exist
     temp_factory('a.txt')
-    clear_now_and_after('b.txt')
     # the workflow should call step K for step C_2, but not C_3
     dag = get_initial_dag(graph)
     #
@@ -322,13 +328,12 @@ def test_auxiliary_steps(temp_factory,clear_now_and_after):
     # and one is to regenerate a.txt because it is not generated
     # by sos (without signature)        #
     #
-    dag.show_nodes()
     assertDAG(
         dag, textwrap.dedent('''
         strict digraph "" {
-        "K (b.txt)";
-        C_3;
         C_2;
+        C_3;
+        "K (b.txt)";
         "K (b.txt)" -> C_2;
         }
         '''))
@@ -355,13 +360,123 @@ def test_cycle():
     '''))
     # the workflow should call step K for step C_2, but not C_3
     wf = script.workflow()
-    pytest.raises(RuntimeError, Base_Executor(wf).initialize_dag)
+    pytest.raises(RuntimeError, lambda: Base_Executor(wf).initialize_dag())
+
 
-def test_long_chain(clear_now_and_after):
+def test_circular_dependencies():
+    '''Test the cycle reported by SoS_DAG.circular_dependencies'''
+    dag = SoS_DAG()
+    #
+    #  A -> B -> C -> D -> E
+    #       ^         |
+    #       |---------|
+    #  X -> C
+    #
+    dag.add_edges_from([('A', 'B'), ('B', 'C'), ('C', 'D'), ('D', 'B'),
+                        ('D', 'E'), ('X', 'C')])
+    cycle = dag.circular_dependencies()
+    assert len(cycle) == 3
+    assert set(cycle) == {('B', 'C'), ('C', 'D'), ('D', 'B')}
+    # consecutive edges are connected and the last one closes the cycle
+    for (_, v), (u, _) in zip(cycle, cycle[1:] + cycle[:1]):
+        assert v == u
+    # an acyclic DAG has no cycle
+    dag.remove_edge('D', 'B')
+    assert dag.circular_dependencies() == []
+    # a cycle downstream of another cycle
+    dag.add_edges_from([('D', 'B'), ('E', 'F'), ('F', 'E')])
+    cycle = dag.circular_dependencies()
+    assert set(cycle) in ({('B', 'C'), ('C', 'D'), ('D', 'B')},
+                          {('E', 'F'), ('F', 'E')})
+    for (_, v), (u, _) in zip(cycle, cycle[1:] + cycle[:1]):
+        assert v == u
+
+def test_dot_id():
+    '''Test quoting of node names in dot format'''
+    assert dot_id('A_1') == 'A_1'
+    assert dot_id('_a2') == '_a2'
+    # names starting with a digit
+    assert dot_id('10') == '"10"'
+    assert dot_id('1a') == '"1a"'
+    # dot keywords, which are case insensitive
+    assert dot_id('node') == '"node"'
+    assert dot_id('Strict') == '"Strict"'
+    # other characters
+    assert dot_id('K (b.txt)') == '"K (b.txt)"'
+    assert dot_id('say "hi"') == r'"say \"hi\""'
+
+
+def test_dot_lines():
+    '''Test output of DAG in dot format'''
+    dag = SoS_DAG(name='10')
+    dag.add_edge('A_1', 'node')
+    dag.add_edge('node', 'K ("b.txt")')
+    dag.add_node('A_1', color='green')
+    lines = list(dag.dot_lines())
+    assert lines[0] == 'strict digraph "10" {'
+    assert lines[-1] == '}'
+    assert lines[1:-1] == [
+        'A_1 [color=green];',
+        r'"K (\"b.txt\")";',
+        '"node";',
+        'A_1 -> "node";',
+        r'"node" -> "K (\"b.txt\")";',
+    ]
+
+
+def test_dot_lines_order():
+    '''Test that nodes and edges are sorted by id, not by rendered line'''
+    dag = SoS_DAG(name='order')
+    dag.add_edge('a_2', 'a_20')
+    dag.add_edge('a_2', 'L_1')
+    dag.add_edge('K (b.txt)', 'L_1')
+    dag.add_edge('A_1', 'K (b.txt)')
+    assert list(dag.dot_lines()) == [
+        'strict digraph order {',
+        'A_1;',
+        '"K (b.txt)";',
+        'L_1;',
+        'a_2;',
+        'a_20;',
+        'A_1 -> "K (b.txt)";',
+        '"K (b.txt)" -> L_1;',
+        'a_2 -> L_1;',
+        'a_2 -> a_20;',
+        '}',
+    ]
+
+
+def test_save_dag():
+    '''Test saving a DAG with status of nodes as colors'''
+    dag = get_initial_dag('''
+        [A_1]
+
+        [A_2]
+
+        [A_3]
+        ''')
+    for node in dag.nodes():
+        if node._node_id == 'A_1':
+            node._status = 'completed'
+        elif node._node_id == 'A_2':
+            node._status = 'running'
+    out = StringIO()
+    dag.save(out)
+    lines = out.getvalue().splitlines()
+    assert lines[0].startswith('strict digraph ')
+    assert lines[1:] == [
+        'A_1 [color=blue];',
+        'A_2 [color=green];',
+        'A_3;',
+        'A_1 -> A_2;',
+        'A_2 -> A_3;',
+        '}',
+    ]
+
+
+def test_long_chain():
     '''Test long make file style dependencies.'''
     #
-    clear_now_and_after('A1.txt', 'A2.txt', 'C2.txt', 'B2.txt', 
-        'B1.txt', 'B3.txt', 'C1.txt', 'C3.txt', 'C4.txt')
 
     #
     #  A1 <- B1 <- B2 <- B3
@@ -423,33 +538,31 @@ def test_long_chain(clear_now_and_after):
         ''')
     , textwrap.dedent('''
         strict digraph "" {
-        "C4 (C4.txt)";
+        A_1;
+        A_2;
         "B1 (B1.txt)";
+        "B2 (B2.txt)";
+        "B3 (B3.txt)";
         "C1 (C1.txt)";
         "C2 (C2.txt)";
         "C3 (C3.txt)";
-        A_1;
-        "B2 (B2.txt)";
-        "B3 (B3.txt)";
-        A_2;
-        "C4 (C4.txt)" -> "C2 (C2.txt)";
-        "C4 (C4.txt)" -> "C3 (C3.txt)";
+        "C4 (C4.txt)";
+        A_1 -> A_2;
         "B1 (B1.txt)" -> A_1;
+        "B2 (B2.txt)" -> A_2;
+        "B2 (B2.txt)" -> "B1 (B1.txt)";
+        "B3 (B3.txt)" -> "B2 (B2.txt)";
         "C1 (C1.txt)" -> "B2 (B2.txt)";
         "C2 (C2.txt)" -> "C1 (C1.txt)";
         "C3 (C3.txt)" -> "C1 (C1.txt)";
-        A_1 -> A_2;
-        "B2 (B2.txt)" -> "B1 (B1.txt)";
-        "B2 (B2.txt)" -> A_2;
-        "B3 (B3.txt)" -> "B2 (B2.txt)";
+        "C4 (C4.txt)" -> "C2 (C2.txt)";
+        "C4 (C4.txt)" -> "C3 (C3.txt)";
         }
         '''))
 
-def test_target(clear_now_and_after):
+def test_target():
     '''Test executing only part of a workflow.'''
     #
-    clear_now_and_after('A1.txt', 'A2.txt', 'C2.txt', 'B2.txt', 
-        'B1.txt', 'B3.txt', 'C1.txt', 'C3.txt', 'C4.txt')
     #
     #  A1 <- B1 <- B2 <- B3
     #   |
@@ -513,20 +626,20 @@ def test_target(clear_now_and_after):
     assertDAG(
         dag, textwrap.dedent('''
         strict digraph "" {
-        "B3 (B3.txt)";
-        "C4 (C4.txt)";
-        "C2 (C2.txt)";
-        "C1 (C1.txt)";
         "B1 (B1.txt)";
         "B2 (B2.txt)";
+        "B3 (B3.txt)";
+        "C1 (C1.txt)";
+        "C2 (C2.txt)";
         "C3 (C3.txt)";
+        "C4 (C4.txt)";
+        "B2 (B2.txt)" -> "B1 (B1.txt)";
         "B3 (B3.txt)" -> "B2 (B2.txt)";
-        "C4 (C4.txt)" -> "C3 (C3.txt)";
-        "C4 (C4.txt)" -> "C2 (C2.txt)";
-        "C2 (C2.txt)" -> "C1 (C1.txt)";
         "C1 (C1.txt)" -> "B2 (B2.txt)";
-        "B2 (B2.txt)" -> "B1 (B1.txt)";
+        "C2 (C2.txt)" -> "C1 (C1.txt)";
         "C3 (C3.txt)" -> "C1 (C1.txt)";
+        "C4 (C4.txt)" -> "C2 (C2.txt)";
+        "C4 (C4.txt)" -> "C3 (C3.txt)";
         }
         '''))
     #
@@ -536,18 +649,18 @@ def test_target(clear_now_and_after):
     assertDAG(
         dag, textwrap.dedent('''
         strict digraph "" {
-        "C4 (C4.txt)";
         "B2 (B2.txt)";
-        "C3 (C3.txt)";
         "B3 (B3.txt)";
-        "C2 (C2.txt)";
         "C1 (C1.txt)";
-        "C4 (C4.txt)" -> "C2 (C2.txt)";
-        "C4 (C4.txt)" -> "C3 (C3.txt)";
-        "C3 (C3.txt)" -> "C1 (C1.txt)";
+        "C2 (C2.txt)";
+        "C3 (C3.txt)";
+        "C4 (C4.txt)";
         "B3 (B3.txt)" -> "B2 (B2.txt)";
-        "C2 (C2.txt)" -> "C1 (C1.txt)";
         "C1 (C1.txt)" -> "B2 (B2.txt)";
+        "C2 (C2.txt)" -> "C1 (C1.txt)";
+        "C3 (C3.txt)" -> "C1 (C1.txt)";
+        "C4 (C4.txt)" -> "C2 (C2.txt)";
+        "C4 (C4.txt)" -> "C3 (C3.txt)";
         }
         '''))
     #
@@ -565,10 +678,9 @@ def test_target(clear_now_and_after):
         }
         '''))
 
-def test_pattern_reuse(clear_now_and_after):
+def test_pattern_reuse():
     '''Test repeated use of steps that use pattern and produce different files.'''
     #
-    clear_now_and_after('A1.txt', 'A2.txt', 'B1.txt', 'B1.txt.p', 'B2.txt', 'B2.txt.p')
     #
     #  A1 <- P <- B1
     #  A1 <- P <- B2
@@ -603,26 +715,25 @@ def test_pattern_reuse(clear_now_and_after):
         ''')
     , textwrap.dedent('''
         strict digraph "" {
-        "P (B2.txt.p)";
+        A_1;
+        A_2;
         "B1 (B1.txt)";
         "B2 (B2.txt)";
-        A_2;
-        A_1;
         "P (B1.txt.p)";
-        "P (B2.txt.p)" -> A_1;
+        "P (B2.txt.p)";
+        A_1 -> A_2;
         "B1 (B1.txt)" -> "P (B1.txt.p)";
         "B2 (B2.txt)" -> "P (B2.txt.p)";
-        A_1 -> A_2;
         "P (B1.txt.p)" -> A_1;
+        "P (B2.txt.p)" -> A_1;
         }
         '''))
 
-def test_parallel_execution(clear_now_and_after):
+def test_parallel_execution():
     '''Test basic parallel execution
     A1 <- None
     A2 <- B2
     '''
-    clear_now_and_after('A1.txt', 'B2.txt', 'A2.txt')
     # the workflow should call step K for step C_2, but not C_3
     assertDAG(
         get_initial_dag('''
@@ -657,11 +768,10 @@ def test_parallel_execution(clear_now_and_after):
     #env.verbosity = 4
     # the process is slower after switching to spawn mode
 
-def test_shared_dependency(clear_now_and_after):
+def test_shared_dependency():
     #
     # shared variable should introduce additional dependency
     #
-    clear_now_and_after('A1.txt')
     #
     # A1 introduces a shared variable ss, A3 depends on ss but not A2
     #
@@ -688,17 +798,16 @@ def test_shared_dependency(clear_now_and_after):
     assertDAG(
         dag, textwrap.dedent('''
         strict digraph "" {
-        A_3;
         A_1;
         A_2;
+        A_3;
         A_1 -> A_3;
         }
         '''))
     env.max_jobs = 3
 
-def test_literal_connection(clear_now_and_after):
+def test_literal_connection():
     '''Testing the connection of steps with by variables.'''
-    clear_now_and_after('A1.txt')
     #
     # A1 introduces a shared variable ss, A3 depends on ss but not A2
     #
@@ -738,12 +847,12 @@ def test_literal_connection(clear_now_and_after):
         dag, textwrap.dedent('''
         strict digraph "" {
         A_1;
-        A_4;
         A_2;
         A_3;
+        A_4;
         A_5;
-        A_1 -> A_4;
         A_1 -> A_3;
+        A_1 -> A_4;
         A_1 -> A_5;
         }
         '''))
@@ -768,9 +877,8 @@ def test_variable_target():
     Base_Executor(wf).run()
     assert env.sos_dict['p'] == 3
 
-def test_reverse_shared_variable(clear_now_and_after):
+def test_reverse_shared_variable():
     '''Test shared variables defined in auxiliary steps'''
-    clear_now_and_after('a.txt')
     script = SoS_Script(textwrap.dedent(r'''
     [A: shared='b', provides='a.txt']
     b = 1
@@ -818,7 +926,7 @@ def test_chained_depends(temp_factory):
 
 @pytest.mark.skipif(
     True, reason='This test is failing')
-def test_output_of_dag(clear_now_and_after):
+def test_output_of_dag():
     '''Test output of dag'''
     #
     #for f in ['A1.txt', 'A2.txt', 'C2.txt', 'B2.txt', 'B1.txt', 'B3.txt', 'C1.txt', 'C3.txt', 'C4.txt']:
@@ -892,20 +1000,20 @@ def test_output_of_dag(clear_now_and_after):
     assertDAG(
         'test_outofdag1.dot', textwrap.dedent('''
         strict digraph "" {
-        "B3 (B3.txt)";
-        "C4 (C4.txt)";
-        "C2 (C2.txt)";
-        "C1 (C1.txt)";
         "B1 (B1.txt)";
         "B2 (B2.txt)";
+        "B3 (B3.txt)";
+        "C1 (C1.txt)";
+        "C2 (C2.txt)";
         "C3 (C3.txt)";
+        "C4 (C4.txt)";
+        "B2 (B2.txt)" -> "B1 (B1.txt)";
         "B3 (B3.txt)" -> "B2 (B2.txt)";
-        "C4 (C4.txt)" -> "C3 (C3.txt)";
-        "C4 (C4.txt)" -> "C2 (C2.txt)";
-        "C2 (C2.txt)" -> "C1 (C1.txt)";
         "C1 (C1.txt)" -> "B2 (B2.txt)";
-        "B2 (B2.txt)" -> "B1 (B1.txt)";
+        "C2 (C2.txt)" -> "C1 (C1.txt)";
         "C3 (C3.txt)" -> "C1 (C1.txt)";
+        "C4 (C4.txt)" -> "C2 (C2.txt)";
+        "C4 (C4.txt)" -> "C3 (C3.txt)";
         }
         '''))
     # test 2, we would like to generate two files
@@ -919,18 +1027,18 @@ def test_output_of_dag(clear_now_and_after):
     assertDAG(
         'test_outofdag2.dot', textwrap.dedent('''
         strict digraph "" {
-        "C4 (C4.txt)";
         "B2 (B2.txt)";
-        "C3 (C3.txt)";
         "B3 (B3.txt)";
-        "C2 (C2.txt)";
         "C1 (C1.txt)";
-        "C4 (C4.txt)" -> "C2 (C2.txt)";
-        "C4 (C4.txt)" -> "C3 (C3.txt)";
-        "C3 (C3.txt)" -> "C1 (C1.txt)";
+        "C2 (C2.txt)";
+        "C3 (C3.txt)";
+        "C4 (C4.txt)";
         "B3 (B3.txt)" -> "B2 (B2.txt)";
-        "C2 (C2.txt)" -> "C1 (C1.txt)";
         "C1 (C1.txt)" -> "B2 (B2.txt)";
+        "C2 (C2.txt)" -> "C1 (C1.txt)";
+        "C3 (C3.txt)" -> "C1 (C1.txt)";
+        "C4 (C4.txt)" -> "C2 (C2.txt)";
+        "C4 (C4.txt)" -> "C3 (C3.txt)";
         }
         '''))
     # test 3, generate two separate trees
@@ -951,11 +1059,10 @@ def test_output_of_dag(clear_now_and_after):
         "C4 (C4.txt)" -> "C2 (C2.txt)";
         }
         '''))
-    clear_now_and_after('C2.txt', 'B3.txt', 'C4.txt', 'test.dot', 'test_2.dot')
 
 @pytest.mark.skipif(
     True, reason='This test is failing')
-def test_step_with_multiple_output(clear_now_and_after):
+def test_step_with_multiple_output():
     '''Test addition of steps with multiple outputs. It should be added only once'''
     script = SoS_Script(textwrap.dedent('''
     [test_1: provides=['{}.txt'.format(i) for i in range(10)]]
@@ -977,7 +1084,6 @@ def test_step_with_multiple_output(clear_now_and_after):
     with open('test.dot') as dot:
         lc = len(dot.readlines())
     assert lc == 6
-    clear_now_and_after('test.dot')
 
 def test_auxiliary_sos_step():
     '''Testing the use of sos_step with auxiliary step. #736'''
@@ -995,9 +1101,8 @@ def test_auxiliary_sos_step():
         touch 1.txt
         ''')
 
-def test_forward_style_depend(clear_now_and_after,temp_factory):
+def test_forward_style_depend(temp_factory):
     '''Test the execution of forward-style workflow with undtermined dependency'''
-    clear_now_and_after('a.txt.bak')
     temp_factory('a.txt')
     execute_workflow('''
         [10]
@@ -1013,7 +1118,7 @@ def test_forward_style_depend(clear_now_and_after,temp_factory):
         ''')
     assert file_target('a.txt.bak').target_exists()
 
-def test_sos_step_miniworkflow(clear_now_and_after):
+def test_sos_step_miniworkflow():
     '''Test the addition of mini forward workflows introduced by sos_step'''
     script = SoS_Script(textwrap.dedent('''
     [a_1]
@@ -1052,7 +1157,6 @@ def test_sos_step_miniworkflow(clear_now_and_after):
     assertDAG(
         'test.dot', textwrap.dedent('''
         strict digraph "" {
-        default;
         a_1;
         a_2;
         a_20;
@@ -1062,6 +1166,7 @@ def test_sos_step_miniworkflow(clear_now_and_after):
         c_1;
         c_2;
         c_20;
+        default;
         a_1 -> a_2;
         a_2 -> a_20;
         a_20 -> default;
@@ -1073,9 +1178,8 @@ def test_sos_step_miniworkflow(clear_now_and_after):
         c_20 -> b_20;
         }
         '''))
-    clear_now_and_after('test.dot')
 
-def test_compound_workflow(clear_now_and_after):
+def test_compound_workflow():
     '''Test the DAG of compound workflow'''
     script = SoS_Script(textwrap.dedent('''
     [A_1]
@@ -1109,7 +1213,6 @@ def test_compound_workflow(clear_now_and_after):
         A_1 -> A_2;
         A_2 -> B;
         }'''))
-    clear_now_and_after('a.txt')
     script = SoS_Script(textwrap.dedent('''
     [A_1]
     [A_2]
@@ -1147,9 +1250,8 @@ def test_provides_sos_variable():
         ''')
 
 
-def test_multi_named_output(clear_now_and_after):
+def test_multi_named_output():
     '''Test DAG built from multiple named_output #1166'''
-    clear_now_and_after('a.txt', 'b.txt', 'test_named_output.dot')
 
     execute_workflow(
         '''
@@ -1165,14 +1267,14 @@ def test_multi_named_output(clear_now_and_after):
     assertDAG('test_named_output.dot', [
         '''
         strict digraph "" {
-        default;
         "A (B)";
+        default;
         "A (B)" -> default;
         }
         ''', '''
         strict digraph "" {
-        default;
         "A (A)";
+        default;
         "A (A)" -> default;
         }
         '''
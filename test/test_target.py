@@ -763,3 +763,32 @@ def test_to_named_path_path():
         }
     )
     assert env.sos_dict['a'] == '#home/xxx/whatever'
+
+
+def test_zap_file_and_signature(tmp_path):
+    """Test zapping existing, zapped, missing and non-regular paths"""
+    # an existing file is replaced by a .zapped file with its signature
+    zap_file = tmp_path / "zap_me.txt"
+    zap_file.write_text("some text")
+    size = os.path.getsize(zap_file)
+    mtime = os.path.getmtime(zap_file)
+    path(zap_file).zap()
+    assert not zap_file.exists()
+    with open(str(zap_file) + ".zapped") as sig:
+        fields = sig.read().strip().split("\t")
+    assert fields[0] == str(zap_file.resolve())
+    assert float(fields[1]) == mtime
+    assert int(fields[2]) == size
+    # a missing file that has already been zapped is ok
+    path(zap_file).zap()
+    assert os.path.isfile(str(zap_file) + ".zapped")
+    # a missing file without .zapped file
+    with pytest.raises(FileNotFoundError):
+        path(tmp_path / "missing.txt").zap()
+    # a directory cannot be zapped
+    zap_dir = tmp_path / "zap_dir"
+    zap_dir.mkdir()
+    with pytest.raises(FileNotFoundError):
+        path(zap_dir).zap()
+    assert zap_dir.is_dir()
+    assert not os.path.exists(str(zap_dir) + ".zapped")